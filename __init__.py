@@ -5,7 +5,20 @@ import time
 
 from Xlib.display import Display
 from Xlib import X
-from Xlib.ext.xtest import fake_input
+
+try:
+    from types import MappingProxyType
+except ImportError:
+    ## Python2 lacks read-only mapping views
+    MappingProxyType = dict
+
+try:
+    import xcffib
+    import xcffib.xproto
+    import xcffib.xtest
+except ImportError:
+    ## Optional, only required by `backend = 'xcb'`
+    xcffib = None
 
 
 __license__ = """
@@ -26,6 +39,95 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
 
+_DEFAULT_BUTTON_IDS = MappingProxyType({
+    'button_left': 1,
+    'button_middle': 2,
+    'button_right': 3,
+    'scroll_up': 4,
+    'scroll_down': 5,
+    'scroll_left': 6,
+    'scroll_right': 7
+})
+
+## Scroll button names and fallback IDs, indexed via `[y > 0]` and `[2 + (x > 0)]`
+_SCROLL_BUTTONS = (
+    ('scroll_down', 5),
+    ('scroll_up', 4),
+    ('scroll_right', 7),
+    ('scroll_left', 6)
+)
+
+_DEFAULT_RELATIVE_CONSTRAINTS = MappingProxyType({
+    'min_x': -25,
+    'max_x': 25,
+    'min_y': -25,
+    'max_y': 25
+})
+
+
+class _LazyXY(object):
+    """
+    List like `[x, y]` coordinates of mouse cursor, queried from the X server on first access
+
+    - `pointer_xy` callable returning `[x, y]`, eg. `mouse._pointer_xy`
+
+    Supports indexing, item assignment, iteration, `+` and comparison, but is not a `list`
+    subclass; wrap with `list(...)` for `isinstance` checks or `json.dumps(...)`
+
+    ## Example
+
+        _location = _LazyXY(mouse._pointer_xy)
+        print("Mouse location -> {}".format(_location))
+    """
+
+    __slots__ = ('_pointer_xy', '_coordinates')
+
+    def __init__(self, pointer_xy):
+        self._pointer_xy = pointer_xy
+        self._coordinates = None
+
+    def _fetch(self):
+        if self._coordinates is None:
+            self._coordinates = self._pointer_xy()
+
+        return self._coordinates
+
+    def __getitem__(self, index):
+        return self._fetch()[index]
+
+    def __setitem__(self, index, value):
+        self._fetch()[index] = value
+
+    def __add__(self, other):
+        if isinstance(other, _LazyXY):
+            other = other._fetch()
+
+        return self._fetch() + other
+
+    def __radd__(self, other):
+        return other + self._fetch()
+
+    def __iter__(self):
+        return iter(self._fetch())
+
+    def __len__(self):
+        return 2
+
+    def __eq__(self, other):
+        if isinstance(other, _LazyXY):
+            other = other._fetch()
+
+        return self._fetch() == other
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self._fetch())
+
+
 class XMouse_Remote(object):
     """
     Python2/3 mouse wrapper API of `Xlib`
@@ -42,12 +144,16 @@ class XMouse_Remote(object):
         print("XMouse_Remote location -> {}".format(mouse.location))
     """
 
-    def __init__(self, display = None, button_ids = None):
+    def __init__(self, display = None, button_ids = None, backend = 'xlib'):
         """
         See -- http://python-xlib.sourceforge.net/doc/html/python-xlib_16.html#SEC15
 
         - `display`, string of X display address eg. `":0"`
         - `button_ids`, dictionary of key name to detail ID mapping
+        - `backend`, either `'xlib'` or `'xcb'`, the latter injects events and queries pointer via optional `xcffib` package
+
+        With `backend = 'xcb'` the `self.display` attribute is `None`, and `self.display.sync()` mentioned
+        by other methods refers to the equivalent call on the `xcffib` connection
 
         ## Example
 
@@ -65,34 +171,91 @@ class XMouse_Remote(object):
             mouse.drag_relative(y = 5, button_name = 'button_left')
             print("XMouse_Remote location -> {}".format(mouse.location))
         """
-        self.display = Display(display)
+        if backend == 'xlib':
+            self.display = Display(display)
+            self._screen = self.display.screen()
+            self._root = self._screen.root
+            self._query_pointer = self._root.query_pointer
+            ## Bound once, `Xlib` attaches `xtest_fake_input` while loading extensions
+            self._xtest_fake_input = self.display.xtest_fake_input
+            self._flush = self.display.flush
+            self._display_sync = self.display.sync
+            self._pending_events = self.display.pending_events
+            self._pointer_xy = self._xlib_pointer_xy
+        elif backend == 'xcb':
+            if xcffib is None:
+                raise ImportError("backend = 'xcb' requires the `xcffib` package")
+
+            ## No `Xlib` connection, requests go through `self._conn` only
+            self.display = None
+            self._conn = xcffib.connect(display = display)
+            self._screen = self._conn.get_setup().roots[self._conn.pref_screen]
+            self._xcb_root = self._screen.root
+            self._xtest = self._conn(xcffib.xtest.key)
+            self._xtest_fake_input = self._xcb_fake_input
+            self._flush = self._conn.flush
+            self._display_sync = self._xcb_sync
+            self._pending_events = self._xcb_pending_events
+            self._pointer_xy = self._xcb_pointer_xy
+        else:
+            raise ValueError("Unknown backend -> {}".format(backend))
+
+        if isinstance(button_ids, dict):
+            self.button_ids = dict(button_ids)
+        else:
+            self.button_ids = dict(_DEFAULT_BUTTON_IDS)
+
+        self._relative_constraints = None
+        self._absolute_constraints = None
+        self._cached_xy = None
 
-        self.button_ids = button_ids
-        if type(self.button_ids) is not dict:
-            self.button_ids = {
-                'button_left': 1,
-                'button_middle': 2,
-                'button_right': 3,
-                'scroll_up': 4,
-                'scroll_down': 5,
-                'scroll_left': 6,
-                'scroll_right': 7
+    @property
+    def button_ids(self):
+        """
+        Returns dictionary of key name to detail ID mapping
+
+        ## Example
+
+            mouse.button_ids['scroll_up'] = 5
+        """
+        return self._button_lookup
+
+    @button_ids.setter
+    def button_ids(self, button_ids):
+        self._button_lookup = button_ids
+
+    @property
+    def relative_constraints(self):
+        """
+        Returns dictionary of `min_x`, `max_x`, `min_y`, and `max_y` for future or super features
+        """
+        if self._relative_constraints is None:
+            self._relative_constraints = dict(_DEFAULT_RELATIVE_CONSTRAINTS)
+
+        return self._relative_constraints
+
+    @relative_constraints.setter
+    def relative_constraints(self, constraints):
+        self._relative_constraints = constraints
+
+    @property
+    def absolute_constraints(self):
+        """
+        Returns dictionary of `min_x`, `max_x`, `min_y`, and `max_y`, zero and positive integers on most displays
+        """
+        if self._absolute_constraints is None:
+            self._absolute_constraints = {
+                'min_x': 0,
+                'max_x': self._screen.width_in_pixels,
+                'min_y': 0,
+                'max_y': self._screen.height_in_pixels
             }
 
-        ## For future or super features
-        self.relative_constraints = {
-            'min_x': -25,
-            'max_x': 25,
-            'min_y': -25,
-            'max_y': 25
-        }
-        ## Zero and positive integers on most displays
-        self.absolute_constraints = {
-            'min_x': 0,
-            'max_x': self.display.screen().width_in_pixels,
-            'min_y': 0,
-            'max_y': self.display.screen().height_in_pixels
-        }
+        return self._absolute_constraints
+
+    @absolute_constraints.setter
+    def absolute_constraints(self, constraints):
+        self._absolute_constraints = constraints
 
     @property
     def location(self):
@@ -103,36 +266,57 @@ class XMouse_Remote(object):
 
             print("Mouse location -> {}".format(mouse.location))
         """
-        _coordinates = self.display.screen().root.query_pointer()._data
-        return [_coordinates.get('root_x'), _coordinates.get('root_y')]
+        self._cached_xy = self._pointer_xy()
+        return list(self._cached_xy)
 
-    def button_click(self, detail = 1, button_name = None, times = 1, sync = True, delays = {0: 0.01}):
+    @property
+    def location_cached(self):
         """
-        Calls `self.button_press(...)` then `self.button_release(...)` a number of `times`
+        Returns `[x, y]` estimate of coordinates last sent to, or read from, the X server
+
+        Not authoritative, pointer movement made by anything other than `self.move_absolute(...)`
+        goes unnoticed; use `self.location` when the real position matters.  Falls back to
+        `self.location` when nothing is cached, eg. after `self.move_relative(...)`, or events are pending
+
+        ## Example
+
+            mouse.move_absolute(x = 10, y = 20)
+            print("Mouse location -> {}".format(mouse.location_cached))
+        """
+        if self._cached_xy is None or self._pending_events() != 0:
+            return self.location
+
+        return self._clamp_xy(*self._cached_xy)
+
+    def button_click(self, detail = 1, button_name = None, times = 1, sync = True, delays = None, delay = 0.01):
+        """
+        Queues press then release of a button a number of `times`, sent to the X server together by `sync`
 
         - `detail` default `detail = 1`, or `button_name` may be used to select a given button
         - `times` number of times to press and release provided `detail` or `button_name`
-        - `sync` default `sync = True`, triggers `self.display.sync()` if `True`
-        - `delays` dictionary default `{0: 0.01}`, seconds to `time.sleep(<n>)` for
+        - `sync` default `sync = True`, triggers `self.display.sync()` once after all clicks if `True`
+        - `delays` deprecated dictionary, if provided `delays[0]` overrides `delay`
+        - `delay` default `delay = 0.01`, seconds the X server waits between each press and release
 
         ## Example
 
-            mouse.button_click(detail = 1, times = 2, delays = {0: 0.05})
+            mouse.button_click(detail = 1, times = 2, delay = 0.05)
         """
-        for _ in range(times):
-            self.button_press(detail = detail, button_name = button_name, sync = sync)
-
-            if delays.get(0, 0) > 0:
-                time.sleep(delays[0])
+        if delays is not None:
+            delay = delays.get(0, 0)
 
-            self.button_release(detail = detail, button_name = button_name, sync = sync)
+        _target_id = self._resolve_button(detail = detail, button_name = button_name)
+        self._burst(detail = _target_id, times = times, delay = delay)
+        self._sync(sync)
 
-    def button_press(self, detail = 1, button_name = None, sync = True):
+    def button_press(self, detail = 1, button_name = None, sync = True, delay = 0, flush_only = False):
         """
         Presses detailed button name
 
         - `detail` default `detail = 1`, or `button_name` may be used to press a given button
         - `sync` default `sync = True`, triggers `self.display.sync()` if `True`
+        - `delay` default `delay = 0`, seconds the X server waits before processing this event
+        - `flush_only` default `flush_only = False`, if `True` then `sync` calls `self.display.flush()` instead
 
         ## Example
 
@@ -141,21 +325,20 @@ class XMouse_Remote(object):
             mouse.move_relative(y = -5)
             mouse.button_release(detail = 1)
         """
-        _target_id = detail
-        if button_name is not None:
-            _target_id = self.button_ids.get(button_name, 1)
+        _target_id = self._resolve_button(detail = detail, button_name = button_name)
 
-        fake_input(self.display, event_type = X.ButtonPress, detail = _target_id)
+        self._xtest_fake_input(X.ButtonPress, _target_id, max(0, int(delay * 1000)))
 
-        if sync:
-            self.display.sync()
+        self._sync(sync, flush_only = flush_only)
 
-    def button_release(self, detail = 1, button_name = None, sync = True):
+    def button_release(self, detail = 1, button_name = None, sync = True, delay = 0, flush_only = False):
         """
         Releases detailed button name
 
         - `detail` default `detail = 1`, or `button_name` may be used to release a given button
         - `sync` default `sync = True`, triggers `self.display.sync()` if `True`
+        - `delay` default `delay = 0`, seconds the X server waits before processing this event
+        - `flush_only` default `flush_only = False`, if `True` then `sync` calls `self.display.flush()` instead
 
         ## Example
 
@@ -164,130 +347,238 @@ class XMouse_Remote(object):
             mouse.move_relative(y = -5)
             mouse.button_release(detail = 1)
         """
-        _target_id = detail
-        if button_name is not None:
-            _target_id = self.button_ids.get(button_name, 1)
+        _target_id = self._resolve_button(detail = detail, button_name = button_name)
 
-        fake_input(self.display, event_type = X.ButtonRelease, detail = detail)
+        self._xtest_fake_input(X.ButtonRelease, _target_id, max(0, int(delay * 1000)))
 
-        if sync:
-            self.display.sync()
+        self._sync(sync, flush_only = flush_only)
 
-    def drag_absolute(self, x, y, detail = 1, button_name = None, sync = True, delays = {0: 0.01, 1: 0.01}):
+    def drag_absolute(self, x, y, detail = 1, button_name = None, sync = True, delays = None, delay_before = 0.01, delay_after = 0.01):
         """
         Starting at `self.location`, moves to absolute coordinates while pressing defined button ID or name
 
         - `x` and `y` are passed to `self.move_absolute(...)` after `self.button_press(...)`
         - `detail` default `detail = 1`, or `button_name` may be used to press and release a button
-        - `sync` default `sync = True`, triggers `self.display.sync()` if `True`
-        - `delays` default `{0: 0.01, 1: 0.01}`, `time.sleep(<n>)` before and after `self.move_absolute(...)`
+        - `sync` default `sync = True`, triggers `self.display.sync()` after `self.button_release(...)` if `True`
+        - `delays` deprecated dictionary, if provided `delays[0]` and `delays[1]` override `delay_before` and `delay_after`
+        - `delay_before` default `delay_before = 0.01`, seconds to `time.sleep(<n>)` before `self.move_absolute(...)`
+        - `delay_after` default `delay_after = 0.01`, seconds to `time.sleep(<n>)` after `self.move_absolute(...)`
 
         ## Example
 
             mouse.move_absolute(x = 0, y = 0)
             mouse.drag_absolute(x = 10, y = 20, detail = 1)
         """
-        self.button_press(detail = detail, button_name = button_name, sync = sync)
+        if delays is not None:
+            delay_before = delays.get(0, 0)
+            delay_after = delays.get(1, 0)
+
+        _target_id = self._resolve_button(detail = detail, button_name = button_name)
+        self.button_press(detail = _target_id, sync = False)
 
-        if delays.get(0, 0) > 0:
-            time.sleep(delays[0])
+        if delay_before > 0:
+            self._flush()
+            time.sleep(delay_before)
 
-        self.move_absolute(x = x, y = y, sync = sync)
+        self.move_absolute(x = x, y = y, sync = False)
 
-        if delays.get(1, 0) > 0:
-            time.sleep(delays[1])
+        if delay_after > 0:
+            self._flush()
+            time.sleep(delay_after)
 
         self.button_release(detail = _target_id, sync = sync)
 
-        return self.location
+        return _LazyXY(self._pointer_xy)
 
-    def drag_relative(self, x = 0, y = 0, detail = 1, button_name = None, sync = True, delays = {0: 0.01, 1: 0.01}):
+    def drag_relative(self, x = 0, y = 0, detail = 1, button_name = None, sync = True, delays = None, delay_before = 0.01, delay_after = 0.01):
         """
         Starting at `self.location`, moves to relative coordinates while pressing defined button ID or name
 
         - `x` and `y` are passed to `self.move_relative(...)` after `self.button_press(...)`
         - `detail` default `detail = 1`, or `button_name` may be used to press and release a button
-        - `sync` default `sync = True`, triggers `self.display.sync()` if `True`
-        - `delays` default `{0: 0.01, 1: 0.01}`, `time.sleep(<n>)` before and after `self.move_relative(...)`
+        - `sync` default `sync = True`, triggers `self.display.sync()` after `self.button_release(...)` if `True`
+        - `delays` deprecated dictionary, if provided `delays[0]` and `delays[1]` override `delay_before` and `delay_after`
+        - `delay_before` default `delay_before = 0.01`, seconds to `time.sleep(<n>)` before `self.move_relative(...)`
+        - `delay_after` default `delay_after = 0.01`, seconds to `time.sleep(<n>)` after `self.move_relative(...)`
 
         ## Example
 
             mouse.drag_relative(x = 5, y = -10, detail = 1)
         """
-        self.button_press(detail = detail, button_name = button_name, sync = sync)
+        if delays is not None:
+            delay_before = delays.get(0, 0)
+            delay_after = delays.get(1, 0)
+
+        _target_id = self._resolve_button(detail = detail, button_name = button_name)
+        self.button_press(detail = _target_id, sync = False)
 
-        if delays.get(0, 0) > 0:
-            time.sleep(delays[0])
+        if delay_before > 0:
+            self._flush()
+            time.sleep(delay_before)
 
-        self.move_relative(x = x, y = y, sync = sync)
+        self.move_relative(x = x, y = y, sync = False)
 
-        if delays.get(1, 0) > 0:
-            time.sleep(delays[1])
+        if delay_after > 0:
+            self._flush()
+            time.sleep(delay_after)
 
-        self.button_release(detail = detail, button_name = button_name, sync = sync)
+        self.button_release(detail = _target_id, sync = sync)
 
-        return self.location
+        return _LazyXY(self._pointer_xy)
 
     def move_absolute(self, x, y, sync = True):
         """
-        Returns `self.location` after telaporting mouse to `x` and `y` coordinates
+        Returns list like location, fetched on first access, after telaporting mouse to `x` and `y` coordinates
 
         See -- https://github.com/python-xlib/python-xlib/blob/master/Xlib/ext/xtest.py
 
         - `x` horizontal coordinate, usually `0` to `self.display.screen().width_in_pixels`
         - `y` vertical coordinate, usually `0` to `self.display.screen().height_in_pixels`
-        - `sync` if `True` will call `self.display.sync()` prior to returning `self.location`
+        - `sync` if `True` will call `self.display.flush()` prior to returning location
+
+        Returned location is not a `list`, wrap with `list(...)` where one is required
 
         ## Example
 
             mouse.move_absolute(x = 0, y = 0)
         """
-        fake_input(self.display, event_type = X.MotionNotify, x = x, y = y)
+        self._xtest_fake_input(X.MotionNotify, 0, X.CurrentTime, X.NONE, x, y)
+        self._cached_xy = (x, y)
 
-        if sync:
-            self.display.sync()
+        ## Reading returned location waits on the server, so flushing is enough
+        self._sync(sync, flush_only = True)
 
-        return self.location
+        return _LazyXY(self._pointer_xy)
 
     def move_relative(self, x = 0, y = 0, sync = True):
         """
-        Returns `self.location` after moving relative distance from current mouse coordinates
+        Returns list like location, fetched on first access, after moving relative distance from current mouse coordinates
+
+        See -- https://www.x.org/releases/X11R7.7/doc/xextproto/xtest.html
 
         - `x` if negative moves mouse Left, and if positive moves mouse Right
         - `y` if negative moves mouse Up, and if positive moves mouse Down
-        - `sync` if `True` will call `self.display.sync()` prior to returning `self.location`
+        - `sync` if `True` will call `self.display.flush()` prior to returning location
+
+        Relative motion is subject to the X server's pointer acceleration, so distance
+        moved may differ from `x` and `y`; use `self.move_absolute(...)` for exact offsets
+
+        Returned location is not a `list`, wrap with `list(...)` where one is required
 
         ## Example
 
             mouse.move_relative(x = 5, y = -10)
         """
-        _new_location = self.location
+        ## XTest treats `detail` of motion events as relative flag
+        self._xtest_fake_input(X.MotionNotify, True, X.CurrentTime, X.NONE, x, y)
+        ## Acceleration makes the resulting coordinates unknowable without a query
+        self._cached_xy = None
 
-        if x != 0:
-            _new_location[0] = _new_location[0] + x
+        ## Reading returned location waits on the server, so flushing is enough
+        self._sync(sync, flush_only = True)
 
-        if y != 0:
-            _new_location[1] = _new_location[1] + y
+        return _LazyXY(self._pointer_xy)
 
-        return self.move_absolute(*_new_location, sync = sync)
-
-    def scroll(self, x = 0, y = 0):
+    def scroll(self, x = 0, y = 0, sync = True):
         """
         Scroll up or left if positive and down or right if negative
 
         - `x` if negative scrolls columns Left, and if positive scrolls columns Right
         - `y` if negative scrolls rows Up, and if positive scrolls rows Down
+        - `sync` default `sync = True`, triggers `self.display.sync()` once after all scrolling if `True`
 
         ## Example
 
             mouse.scroll(x = 5, y = -10)
         """
-        if y > 0:
-            self.button_click(detail = self.button_ids.get('scroll_up', 4), times = y)
-        elif y < 0:
-            self.button_click(detail = self.button_ids.get('scroll_down', 5), times = abs(y))
+        if y:
+            self._burst(detail = self._button_lookup.get(*_SCROLL_BUTTONS[y > 0]), times = abs(y))
+
+        if x:
+            self._burst(detail = self._button_lookup.get(*_SCROLL_BUTTONS[2 + (x > 0)]), times = abs(x))
+
+        self._sync(sync)
+
+    def _burst(self, detail, times, delay = 0.01):
+        """
+        Queues `times` press and release pairs of `detail`, callers send them via `self._sync(...)`
+
+        - `delay` default `delay = 0.01`, seconds the X server waits between each press and release
+        """
+        _fake_input = self._xtest_fake_input
+        _time = max(0, int(delay * 1000))
+        for _ in range(times):
+            _fake_input(X.ButtonPress, detail)
+            _fake_input(X.ButtonRelease, detail, _time)
+
+    def _xlib_pointer_xy(self):
+        """
+        Returns `[x, y]` list of mouse cursor coordinates via `Xlib`
+        """
+        _coordinates = self._query_pointer()._data
+        return [_coordinates['root_x'], _coordinates['root_y']]
+
+    def _xcb_pointer_xy(self):
+        """
+        Returns `[x, y]` list of mouse cursor coordinates via `xcffib`
+        """
+        _reply = self._conn.core.QueryPointer(self._xcb_root).reply()
+        return [_reply.root_x, _reply.root_y]
+
+    def _xcb_fake_input(self, event_type, detail = 0, time = X.CurrentTime, root = X.NONE, x = 0, y = 0):
+        """
+        Queues unchecked XTest `FakeInput` request, arguments match `Xlib` `xtest_fake_input`
+        """
+        self._xtest.FakeInput(event_type, detail, time, root, x, y, 0)
+
+    def _xcb_sync(self):
+        """
+        Flushes `xcffib` connection and waits for a light-weight reply, like `Xlib` `display.sync()`
+        """
+        self._conn.core.GetInputFocus().reply()
+
+    def _xcb_pending_events(self):
+        """
+        Returns `0`, this private `xcffib` connection selects no events
+
+        `xcffib` cannot peek at its queue, and polling would consume events or raise queued errors
+        """
+        return 0
+
+    def _clamp_xy(self, x, y):
+        """
+        Returns `[x, y]` limited to screen dimensions, as the X server does when moving the pointer
+        """
+        _screen = self._screen
+        return [
+            min(max(x, 0), _screen.width_in_pixels - 1),
+            min(max(y, 0), _screen.height_in_pixels - 1)
+        ]
+
+    def _resolve_button(self, detail = 1, button_name = None):
+        """
+        Returns button ID for `button_name`, or `detail` when no name is provided
+
+        Unknown `button_name` values fall back to `1`, ie. `button_left` with default `button_ids`
+        """
+        if button_name is None:
+            return detail
+
+        try:
+            return self._button_lookup[button_name]
+        except KeyError:
+            return 1
+
+    def _sync(self, sync = True, flush_only = False):
+        """
+        Calls `self.display.sync()` if `sync` is `True`, otherwise requests stay buffered by `Xlib`
+
+        - `flush_only` if `True` calls `self.display.flush()` instead, sending requests without waiting on a reply
+        """
+        if not sync:
+            return
 
-        if x > 0:
-            self.button_click(detail = self.button_ids.get('scroll_left', 6), times = x)
-        elif x < 0:
-            self.button_click(detail = self.button_ids.get('scroll_right', 7), times = abs(x))
+        if flush_only:
+            self._flush()
+        else:
+            self._display_sync()